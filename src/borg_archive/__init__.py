@@ -29,7 +29,6 @@ compressed files.
 
 __version__ = "0.1.1"
 
-from .core import BorgArchive
 from .exceptions import (
     BorgArchiveError,
     CommandNotFoundError,
@@ -62,3 +61,13 @@ __all__ = [
     "UpdateError",
     "ConfigurationError",
 ]
+
+
+def __getattr__(name):
+    # Resolve BorgArchive lazily so the command-line tool does not pay for
+    # importing .core (and rich) before a subcommand actually needs it.
+    if name == "BorgArchive":
+        from .core import BorgArchive
+
+        return BorgArchive
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -25,333 +25,88 @@ Command-line interface for borg-archive, a wrapper that allows Borg Backup to
  CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import importlib
 import sys
-from pathlib import Path
-from typing import Optional
 
 import click
-from rich.console import Console
 
-from .core import BorgArchive
+from . import __version__
+from .commands import print_error
 from .exceptions import BorgArchiveError
-from .utils import confirm_overwrite
-
-console = Console()
 
 CONTEXT_SETTINGS = {
     "help_option_names": ["-h", "--help"],
     "max_content_width": 100,
 }
 
-
-@click.group(context_settings=CONTEXT_SETTINGS)
-@click.version_option()
-def main():
-    """
-    A tool for creating single-file compressed archives using Borg Backup.
-
-    This tool allows you to create, extract, mount, and update Borg
-    repositories that are stored as single compressed files.
-    """
-    pass
-
-
-@main.command()
-@click.argument("repo_directory", type=click.Path())
-@click.argument("archive_file", type=click.Path())
-@click.option(
-    "--keep-repo",
-    is_flag=True,
-    help="Retain the expanded repository directory after the collapse operation.",
+# Subcommand names; each lives in `borg_archive.commands.<name>` (with dashes
+# replaced by underscores) and is only imported when it is needed.
+COMMANDS = (
+    "batch",
+    "collapse",
+    "completion",
+    "create",
+    "create-expanded",
+    "expand",
+    "extract",
+    "list",
+    "mount",
+    "umount",
+    "unmount",
+    "update",
 )
-@click.option(
-    "--max-compression",
-    is_flag=True,
-    default=False,
-    help="Apply maximum (level 9) outer-layer compression. Default uses light compression "
-    "since borg already compresses data internally.",
-)
-def collapse(
-    repo_directory: str,
-    archive_file: str,
-    keep_repo: bool = False,
-    max_compression: bool = False,
-):
-    """Collapse REPO_DIRECTORY from `expand` command back into a single-file archive.
-
-    REPO_DIRECTORY is the expanded repo from the `expand` command.
 
-    ARCHIVE_FILE is the path to the single-file archive.  If the file exists,
-    you will be prompted before overwriting it.
 
-    The repository REPO_DIRECTORY will be removed after archiving unless
-    the --keep-repo option is provided.
+class LazyGroup(click.Group):
     """
-    try:
-        archive_path = Path(archive_file)
-        if archive_path.exists() and not confirm_overwrite(archive_path):
-            sys.exit(0)
-        with BorgArchive(archive_path) as archive:
-            archive.collapse(
-                repo_directory, retain_repo=keep_repo, max_compression=max_compression
-            )
-    except BorgArchiveError as e:
-        console.print(f"Failed to collapse the repository: {e}")
-
-
-@main.command()
-@click.argument("archive_file", type=click.Path())
-@click.argument(
-    "source_dir", type=click.Path(exists=True, file_okay=False, dir_okay=True)
-)
-@click.argument("borg_options", nargs=-1, type=click.UNPROCESSED)
-@click.option(
-    "--max-compression",
-    is_flag=True,
-    default=False,
-    help="Apply maximum (level 9) outer-layer compression. Default uses light compression "
-    "since borg already compresses data internally.",
-)
-def create(
-    archive_file: str,
-    source_dir: str,
-    borg_options: tuple = (),
-    max_compression: bool = False,
-):
+    A click.Group that imports a subcommand's module only when it is dispatched,
+    and reports any BorgArchiveError a subcommand raises as a one-line error.
     """
-    Create a new archive from SOURCE_DIR.
 
-    ARCHIVE_FILE is the path where the new archive will be created.
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*COMMANDS, *super().list_commands(ctx)})
 
-    SOURCE_DIR is the directory to archive.
-
-    Any additional BORG_OPTIONS are passed directly to the borg create command.
-    """
-    try:
-        archive_path = Path(archive_file)
-        if archive_path.exists() and not confirm_overwrite(archive_path):
-            sys.exit(0)
-
-        with BorgArchive(archive_path) as archive:
-            archive.create(
-                source_dir=Path(source_dir),
-                encryption="none",
-                borg_options=list(borg_options) if borg_options else None,
-                max_compression=max_compression,
-            )
-    except BorgArchiveError as e:
-        console.print(f"[red]Error:[/red] {e}")
-        sys.exit(1)
-
-
-@main.command(name="create-expanded")
-@click.argument("repo_directory", type=click.Path())
-@click.argument(
-    "source_dir", type=click.Path(exists=True, file_okay=False, dir_okay=True)
-)
-@click.argument("borg_options", nargs=-1, type=click.UNPROCESSED)
-def create_expanded(
-    repo_directory: str,
-    source_dir: str,
-    borg_options: tuple = (),
-):
-    """
-    Create a new expanded archive from SOURCE_DIR.  Expanded archives support
-    efficient `update` operations and may be collapsed into an archive file
-    with the `collapse` command.
-
-    REPO_DIRECTORY is the path where the expanded archive will be created.
-
-    SOURCE_DIR is the directory to archive.
-
-    Any additional BORG_OPTIONS are passed directly to the borg create command.
-    """
-    try:
-        archive_path = Path(repo_directory)
-        if archive_path.exists() and not confirm_overwrite(archive_path):
-            sys.exit(0)
-
-        with BorgArchive(archive_path) as archive:
-            archive.create(
-                source_dir=Path(source_dir),
-                encryption="none",
-                expanded=True,
-                borg_options=list(borg_options) if borg_options else None,
-            )
-    except BorgArchiveError as e:
-        console.print(f"[red]Error:[/red] {e}")
-        sys.exit(1)
-
-
-@main.command()
-@click.argument("archive_file", type=click.Path(exists=True))
-@click.argument("repo_directory", type=click.Path())
-def expand(archive_file: str, repo_directory: str):
-    """
-    Expand the compressed archive ARCHIVE_FILE into a repository REPO_DIRECTORY
-    for faster list and update operations.
-
-    If REPO_DIRECTORY exists and is non-empty, this command will fail.
-    """
-    try:
-        repo_path = Path(repo_directory)
-        with BorgArchive(Path(archive_file)) as archive:
-            archive.expand(repo_path)
-    except BorgArchiveError as e:
-        console.print(f"[red]Error:[/red] {e}")
-        sys.exit(1)
-
-
-@main.command()
-@click.argument("archive_file", type=click.Path(exists=True))
-@click.argument("output_dir", type=click.Path())
-@click.option("--tag", help="Specific tag to extract (default: latest)")
-def extract(archive_file: str, output_dir: str, tag: Optional[str]):
-    """
-    Extract ARCHIVE_FILE to OUTPUT_DIR.
-
-    If OUTPUT_DIR exists, you will be prompted before overwriting its contents.
-    """
-    try:
-        output_path = Path(output_dir)
-        if output_path.exists() and not confirm_overwrite(output_path):
-            sys.exit(0)
-        with BorgArchive(Path(archive_file)) as archive:
-            archive.extract(output_path, tag)
-    except BorgArchiveError as e:
-        console.print(f"[red]Error:[/red] {e}")
-        sys.exit(1)
-
-
-@main.command()
-@click.argument("archive_or_repo", type=click.Path(exists=True))
-def list(archive_or_repo: str):
-    """List all available tags in ARCHIVE_OR_REPO, which is either an archive file or an expanded repository directory."""
-    try:
-        archive_path = Path(archive_or_repo)
-        repo_path = None
-        if archive_path.is_dir():
-            repo_path = archive_path
-            archive_path = None
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or cmd_name not in COMMANDS:
+            return command
+        module = importlib.import_module(
+            f".commands.{cmd_name.replace('-', '_')}", __package__
+        )
+        return module.cmd
 
-        with BorgArchive(
-            archive_or_repo_path=archive_path, repo_path=repo_path
-        ) as archive:
-            archive.list_tags()
-    except BorgArchiveError as e:
-        console.print(f"[red]Error:[/red] {e}")
-        sys.exit(1)
+    def invoke(self, ctx: click.Context):
+        try:
+            return super().invoke(ctx)
+        except BorgArchiveError as e:
+            print_error(f"Error: {e}")
+            sys.exit(1)
 
 
-@main.command()
-@click.argument("archive_file", type=click.Path(exists=True))
-@click.argument("mount_dir", type=click.Path())
-@click.option("--tag", help="Specific tag to mount (default: latest)")
-def mount(archive_file: str, mount_dir: str, tag: Optional[str]):
+@click.group(cls=LazyGroup, context_settings=CONTEXT_SETTINGS)
+@click.version_option(__version__, prog_name="borg-archive")
+def main():
     """
-    Mount ARCHIVE_FILE to MOUNT_DIR (read-only).
+    A tool for creating single-file compressed archives using Borg Backup.
 
-    MOUNT_DIR will be created if it does not exist.
+    This tool allows you to create, extract, mount, and update Borg
+    repositories that are stored as single compressed files.
     """
-    try:
-        with BorgArchive(Path(archive_file)) as archive:
-            archive.mount(Path(mount_dir), tag)
-    except BorgArchiveError as e:
-        console.print(f"[red]Error:[/red] {e}")
-        sys.exit(1)
-
-
-def do_unmount(mount_dir: str):
-    """Perform the work for unmounting a previously mounted archive from MOUNT_DIR."""
-    try:
-        with BorgArchive() as ba:
-            ba.unmount(Path(mount_dir))
-    except BorgArchiveError as e:
-        console.print(f"[red]Error:[/red] {e}")
-        sys.exit(1)
-
-
-@main.command()
-@click.argument("mount_dir", type=click.Path(exists=True))
-def umount(mount_dir: str):
-    """Unmount a previously mounted archive from MOUNT_DIR."""
-    do_unmount(mount_dir)
-
-
-# We publish `umount` as the official command, but let this
-# common type work as well.
-@main.command(hidden=True)
-@click.argument("mount_dir", type=click.Path(exists=True))
-def unmount(mount_dir: str):
-    """Alias for `umount`."""
-    do_unmount(mount_dir)
+    pass
 
 
-@main.command()
-@click.argument("archive_or_repo", type=click.Path(exists=True))
-@click.argument(
-    "source_dir_or_repo", type=click.Path(exists=True, file_okay=False, dir_okay=True)
-)
-@click.option("--tag", help="Tag for this update (default: auto-numbering)")
-@click.option(
-    "--max-compression",
-    is_flag=True,
-    default=False,
-    help="Apply maximum (level 9) outer-layer compression. Default uses light compression "
-    "since borg already compresses data internally.",
-)
-def update(
-    archive_or_repo: str,
-    source_dir_or_repo: str,
-    tag: Optional[str],
-    max_compression: bool = False,
-):
+def run():
     """
-    Update ARCHIVE_OR_REPO with changes from SOURCE_DIR_OR_REPO.
-
-    Creates a new tag in the ARCHIVE or expanded REPO containing
-    the current state of SOURCE_DIR, or updates the expanded REPO
-    to match the current state of SOURCE_DIR, or updates the ARCHIVE file
-    to match the current state of the REPO.
-
-    IMPORTANT:  You cannot use an expanded repository path for both
-    ARCHIVE_OR_REPO and SOURCE_DIR_OR_REPO simultaneously.
-
-    Examples:
-
-    Update archive file to reflect changes to local data files:
-
-        borg-archive update my-data-archive.baz my-data
+    Console-script entry point.
 
-
-    Update expanded repository to reflect changes to local data files:
-
-        borg-archive update my-expanded-repo my-data
-
-    Update archive to reflect changes to expanded repository:
-
-        borg-archive update my-data-archive.baz my-expanded-repo
+    A bare `--version` is answered directly, without Click having to set up the
+    command group at all; everything else is handed to `main`.
     """
-    archive_or_repo = Path(archive_or_repo)
-    source_dir_or_repo = Path(source_dir_or_repo)
-
-    # Enforce that both arguments cannot simultaneously reference a repositories.
-    if (
-        archive_or_repo.is_dir()
-        and source_dir_or_repo.is_dir()
-        and BorgArchive.dir_is_repo(source_dir_or_repo)
-    ):
-        console.print(
-            f"[red]Error:[/red] Only one of ARCHIVE_OR_REPO or SOURCE_DIR_OR_REPO may be an expanded repository directory."
-        )
-        sys.exit(1)
-    try:
-        with BorgArchive(Path(archive_or_repo)) as archive:
-            archive.update(Path(source_dir_or_repo), tag, max_compression=max_compression)
-    except BorgArchiveError as e:
-        console.print(f"[red]Error:[/red] {e}")
-        sys.exit(1)
+    if sys.argv[1:] == ["--version"]:
+        click.echo(f"borg-archive, version {__version__}")
+        return
+    main()
 
 
 if __name__ == "__main__":
-    main()
+    run()
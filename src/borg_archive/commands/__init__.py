@@ -0,0 +1,135 @@
+"""
+ Subcommands for the borg-archive command-line interface, one module per
+ command, plus helpers shared between them.
+
+ Each command module defines its Click command as the module attribute `cmd`;
+ `borg_archive.cli` imports a module only when its command is invoked.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import stat
+from functools import lru_cache
+from pathlib import Path
+
+import click
+
+# `..core` is comparatively expensive to import (it pulls in rich), so the
+# commands import it inside their function bodies rather than at module import.
+# This keeps `--help`, `--version`, and argument errors fast.
+
+
+def print_error(msg: str) -> None:
+    """Print an error message to standard error."""
+    click.secho(msg, fg="red", err=True)
+
+
+@lru_cache(maxsize=None)
+def cached_stat(path: str) -> os.stat_result | None:
+    """
+    Stat `path` at most once per invocation.
+
+    Only used for the argument checks a command makes before handing paths to
+    BorgArchive, so results never go stale within a command.
+
+    Returns:
+        The stat result, or None if the path does not exist
+    """
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def canonical_path(path: str) -> Path:
+    """
+    Return the canonical (symlink-free, absolute) form of a command-line path.
+
+    Commands canonicalize their path arguments once, up front, and pass the
+    result on, so the same path is not walked by `realpath` again for every
+    use within the command.
+    """
+    return Path(os.path.realpath(path))
+
+
+def confirm_if_present(path: Path, assume_yes: bool = False) -> bool:
+    """
+    Ask before overwriting `path`, but only if there is something to overwrite.
+
+    A single `os.scandir` stands in for the `exists()` check that would otherwise
+    precede the prompt: a missing path or an empty directory needs no
+    confirmation, while a file or a non-empty directory does.
+
+    Args:
+        path: Output path a command is about to write to
+        assume_yes: Skip the check and the prompt entirely (`-y/--yes`)
+
+    Returns:
+        True if the command may proceed, False if the user declined
+    """
+    if assume_yes:
+        return True
+
+    try:
+        entries = os.scandir(path)
+    except FileNotFoundError:
+        return True
+    except OSError:
+        # A file, or a directory that cannot be listed: either way something is
+        # there, so ask.
+        pass
+    else:
+        with entries:
+            if next(entries, None) is None:
+                return True
+
+    from ..utils import confirm_overwrite
+
+    return confirm_overwrite(path)
+
+
+def require_path(path: Path, param_hint: str, dir_only: bool = False) -> os.stat_result:
+    """
+    Stat a path argument that must exist, standing in for `click.Path(exists=True)`.
+
+    Doing the check here rather than in Click lets the command hand the stat
+    result on to BorgArchive instead of the same path being stat-ed again.
+
+    Args:
+        path: Path supplied on the command line
+        param_hint: Argument name to show in the usage error, e.g. "'ARCHIVE_FILE'"
+        dir_only: If True, the path must also be a directory
+
+    Returns:
+        The stat result for `path`
+
+    Raises:
+        click.BadParameter: If the path does not exist (or is not a directory)
+    """
+    st = cached_stat(os.fspath(path))
+    if st is None:
+        raise click.BadParameter(f"Path '{path}' does not exist.", param_hint=param_hint)
+    if dir_only and not stat.S_ISDIR(st.st_mode):
+        raise click.BadParameter(f"Directory '{path}' is a file.", param_hint=param_hint)
+    return st
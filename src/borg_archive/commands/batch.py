@@ -0,0 +1,125 @@
+"""
+ The `batch` command for borg-archive.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import contextlib
+import os
+import shlex
+import sys
+
+import click
+
+from . import canonical_path
+
+# The read-only operations `batch` understands, parsed with the same argument
+# layout as the corresponding top-level commands.
+_OPERATIONS = {
+    "list": click.Command(
+        "list", params=[click.Argument(["archive_file"], metavar="ARCHIVE_OR_REPO")]
+    ),
+    "extract": click.Command(
+        "extract",
+        params=[
+            click.Argument(["archive_file"]),
+            click.Argument(["output_dir"]),
+            click.Option(["--tag"], help="Specific tag to extract (default: latest)"),
+        ],
+    ),
+}
+
+
+@click.command()
+@click.pass_context
+def batch(ctx: click.Context):
+    """
+    Run `list` and `extract` commands read from standard input, one per line.
+
+    Each line holds a command and its arguments exactly as they would be given
+    on the command line, e.g. `extract archive.baz out-dir --tag 2`.  Blank
+    lines and `#` comments are ignored.
+
+    Each archive file is expanded only once, however many lines refer to it,
+    as long as the file does not change while the batch runs.  Because the
+    commands arrive on standard input, `extract` will not prompt before
+    overwriting: an OUTPUT_DIR that already exists is an error.
+    """
+    from ..core import BorgArchive
+
+    # Open archives, keyed by identity and modification state of the file, so a
+    # rewritten archive is expanded afresh instead of served from a stale repo.
+    archives: dict[tuple[str, int, int], BorgArchive] = {}
+    with contextlib.ExitStack() as stack:
+        for line in sys.stdin:
+            args = shlex.split(line, comments=True)
+            if not args:
+                continue
+            name, *rest = args
+            operation = _OPERATIONS.get(name)
+            if operation is None:
+                raise click.UsageError(
+                    f"Unsupported batch command '{name}' "
+                    f"(expected one of: {', '.join(_OPERATIONS)}).",
+                    ctx=ctx,
+                )
+            with operation.make_context(name, rest, parent=ctx) as op_ctx:
+                params = op_ctx.params
+
+            archive_path = canonical_path(params["archive_file"])
+            # Not the cached stat: the key must reflect the file as it is now.
+            try:
+                archive_stat = os.stat(archive_path)
+            except FileNotFoundError:
+                raise click.BadParameter(
+                    f"Path '{archive_path}' does not exist.",
+                    ctx=op_ctx,
+                    param_hint=f"'{operation.params[0].human_readable_name}'",
+                )
+            key = (
+                os.fspath(archive_path),
+                archive_stat.st_mtime_ns,
+                archive_stat.st_size,
+            )
+            archive = archives.get(key)
+            if archive is None:
+                archive = stack.enter_context(
+                    BorgArchive(archive_path, path_stat=archive_stat, resolved=True)
+                )
+                archives[key] = archive
+
+            if name == "list":
+                archive.list_tags()
+            else:
+                output_path = canonical_path(params["output_dir"])
+                # Not the cached stat either: an earlier line may have just
+                # created this directory.
+                if os.path.lexists(output_path):
+                    raise click.BadParameter(
+                        f"Path '{output_path}' already exists.",
+                        ctx=op_ctx,
+                        param_hint="'OUTPUT_DIR'",
+                    )
+                archive.extract(output_path, params["tag"])
+
+
+cmd = batch
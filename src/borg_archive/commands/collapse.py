@@ -0,0 +1,85 @@
+"""
+ The `collapse` command for borg-archive.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sys
+
+import click
+
+from . import canonical_path, confirm_if_present
+
+
+@click.command()
+@click.argument("repo_directory", type=click.Path())
+@click.argument("archive_file", type=click.Path())
+@click.option(
+    "--keep-repo",
+    is_flag=True,
+    help="Retain the expanded repository directory after the collapse operation.",
+)
+@click.option(
+    "--max-compression",
+    is_flag=True,
+    default=False,
+    help="Apply maximum (level 9) outer-layer compression. Default uses light compression "
+    "since borg already compresses data internally.",
+)
+@click.option(
+    "-y",
+    "--yes",
+    is_flag=True,
+    default=False,
+    help="Overwrite an existing output without asking.",
+)
+def collapse(
+    repo_directory: str,
+    archive_file: str,
+    keep_repo: bool = False,
+    max_compression: bool = False,
+    yes: bool = False,
+):
+    """Collapse REPO_DIRECTORY from `expand` command back into a single-file archive.
+
+    REPO_DIRECTORY is the expanded repo from the `expand` command.
+
+    ARCHIVE_FILE is the path to the single-file archive.  If the file exists,
+    you will be prompted before overwriting it.
+
+    The repository REPO_DIRECTORY will be removed after archiving unless
+    the --keep-repo option is provided.
+    """
+    from ..core import BorgArchive
+
+    archive_path = canonical_path(archive_file)
+    if not confirm_if_present(archive_path, assume_yes=yes):
+        sys.exit(0)
+    with BorgArchive(archive_path, resolved=True) as archive:
+        archive.collapse(
+            canonical_path(repo_directory),
+            retain_repo=keep_repo,
+            max_compression=max_compression,
+        )
+
+
+cmd = collapse
@@ -0,0 +1,77 @@
+"""
+ The hidden `completion` command for borg-archive.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import click
+
+_BASH_TEMPLATE = """\
+_borg_archive_completion() {{
+    if [[ ${{COMP_CWORD}} -eq 1 ]]; then
+        COMPREPLY=($(compgen -W "{commands}" -- "${{COMP_WORDS[1]}}"))
+    fi
+}}
+complete -o default -F _borg_archive_completion borg-archive
+"""
+
+_ZSH_TEMPLATE = """\
+#compdef borg-archive
+
+_borg_archive() {{
+    if (( CURRENT == 2 )); then
+        compadd -- {commands}
+    else
+        _files
+    fi
+}}
+
+compdef _borg_archive borg-archive
+"""
+
+_TEMPLATES = {"bash": _BASH_TEMPLATE, "zsh": _ZSH_TEMPLATE}
+
+
+@click.command(hidden=True)
+@click.argument("shell", type=click.Choice(sorted(_TEMPLATES)))
+@click.pass_context
+def completion(ctx: click.Context, shell: str):
+    """
+    Print a static SHELL completion script for borg-archive.
+
+    The script lists the subcommands itself, so pressing TAB never has to start
+    Python.  Save the output once (and again after upgrading), e.g.
+
+        borg-archive completion bash > ~/.local/share/bash-completion/completions/borg-archive
+
+    or, for zsh, source the saved file from ~/.zshrc after `compinit`.
+    """
+    group = ctx.parent.command
+    commands = []
+    for name in group.list_commands(ctx):
+        command = group.get_command(ctx, name)
+        if command is not None and not command.hidden:
+            commands.append(name)
+    click.echo(_TEMPLATES[shell].format(commands=" ".join(commands)), nl=False)
+
+
+cmd = completion
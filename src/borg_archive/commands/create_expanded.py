@@ -0,0 +1,88 @@
+"""
+ The `create-expanded` command for borg-archive.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sys
+
+import click
+
+from . import canonical_path, confirm_if_present
+
+
+@click.command(name="create-expanded")
+@click.argument("repo_directory", type=click.Path())
+@click.argument(
+    "source_dir", type=click.Path(exists=True, file_okay=False, dir_okay=True)
+)
+@click.argument("borg_options", nargs=-1, type=click.UNPROCESSED)
+@click.option(
+    "--compression-level",
+    type=click.IntRange(1, 22),
+    default=3,
+    show_default=True,
+    help="zstd level borg uses to compress the data itself. Higher levels give a "
+    "smaller repository but are much slower.",
+)
+@click.option(
+    "-y",
+    "--yes",
+    is_flag=True,
+    default=False,
+    help="Overwrite an existing output without asking.",
+)
+def create_expanded(
+    repo_directory: str,
+    source_dir: str,
+    borg_options: tuple = (),
+    compression_level: int = 3,
+    yes: bool = False,
+):
+    """
+    Create a new expanded archive from SOURCE_DIR.  Expanded archives support
+    efficient `update` operations and may be collapsed into an archive file
+    with the `collapse` command.
+
+    REPO_DIRECTORY is the path where the expanded archive will be created.
+
+    SOURCE_DIR is the directory to archive.
+
+    Any additional BORG_OPTIONS are passed directly to the borg create command.
+    """
+    from ..core import BorgArchive
+
+    archive_path = canonical_path(repo_directory)
+    if not confirm_if_present(archive_path, assume_yes=yes):
+        sys.exit(0)
+
+    with BorgArchive(archive_path, resolved=True) as archive:
+        archive.create(
+            source_dir=canonical_path(source_dir),
+            encryption="none",
+            expanded=True,
+            borg_options=list(borg_options) if borg_options else None,
+            compression_level=compression_level,
+        )
+
+
+cmd = create_expanded
@@ -0,0 +1,61 @@
+"""
+ The `extract` command for borg-archive.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sys
+
+import click
+
+from . import canonical_path, confirm_if_present, require_path
+
+
+@click.command()
+@click.argument("archive_file", type=click.Path())
+@click.argument("output_dir", type=click.Path())
+@click.option("--tag", help="Specific tag to extract (default: latest)")
+@click.option(
+    "-y",
+    "--yes",
+    is_flag=True,
+    default=False,
+    help="Overwrite an existing output without asking.",
+)
+def extract(archive_file: str, output_dir: str, tag: str | None, yes: bool = False):
+    """
+    Extract ARCHIVE_FILE to OUTPUT_DIR.
+
+    If OUTPUT_DIR exists, you will be prompted before overwriting its contents.
+    """
+    from ..core import BorgArchive
+
+    archive_path = canonical_path(archive_file)
+    archive_stat = require_path(archive_path, "'ARCHIVE_FILE'")
+    output_path = canonical_path(output_dir)
+    if not confirm_if_present(output_path, assume_yes=yes):
+        sys.exit(0)
+    with BorgArchive(archive_path, path_stat=archive_stat, resolved=True) as archive:
+        archive.extract(output_path, tag)
+
+
+cmd = extract
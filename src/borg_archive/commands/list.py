@@ -0,0 +1,44 @@
+"""
+ The `list` command for borg-archive.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import click
+
+from . import canonical_path, require_path
+
+
+@click.command()
+@click.argument("archive_or_repo", type=click.Path())
+def list(archive_or_repo: str):
+    """List all available tags in ARCHIVE_OR_REPO, which is either an archive file or an expanded repository directory."""
+    from ..core import BorgArchive
+
+    archive_path = canonical_path(archive_or_repo)
+    archive_stat = require_path(archive_path, "'ARCHIVE_OR_REPO'")
+    # BorgArchive treats a directory as an expanded repository.
+    with BorgArchive(archive_path, path_stat=archive_stat, resolved=True) as archive:
+        archive.list_tags()
+
+
+cmd = list
@@ -0,0 +1,46 @@
+"""
+ The `umount` command for borg-archive.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import click
+
+from . import canonical_path
+
+
+def do_unmount(mount_dir: str):
+    """Perform the work for unmounting a previously mounted archive from MOUNT_DIR."""
+    from ..core import BorgArchive
+
+    with BorgArchive() as ba:
+        ba.unmount(canonical_path(mount_dir))
+
+
+@click.command()
+@click.argument("mount_dir", type=click.Path())
+def umount(mount_dir: str):
+    """Unmount a previously mounted archive from MOUNT_DIR."""
+    do_unmount(mount_dir)
+
+
+cmd = umount
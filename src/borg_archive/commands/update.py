@@ -0,0 +1,126 @@
+"""
+ The `update` command for borg-archive.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import click
+
+from ..exceptions import ValidationError
+from . import canonical_path
+
+
+@click.command()
+@click.argument("archive_or_repo", type=click.Path())
+@click.argument("source_dir_or_repo", type=click.Path())
+@click.option("--tag", help="Tag for this update (default: auto-numbering)")
+@click.option(
+    "--max-compression",
+    is_flag=True,
+    default=False,
+    help="Apply maximum (level 9) outer-layer compression. Default uses light compression "
+    "since borg already compresses data internally.",
+)
+@click.option(
+    "--compression-level",
+    type=click.IntRange(1, 22),
+    default=3,
+    show_default=True,
+    help="zstd level borg uses to compress the data itself. Higher levels give a "
+    "smaller repository but are much slower.",
+)
+def update(
+    archive_or_repo: str,
+    source_dir_or_repo: str,
+    tag: str | None,
+    max_compression: bool = False,
+    compression_level: int = 3,
+):
+    """
+    Update ARCHIVE_OR_REPO with changes from SOURCE_DIR_OR_REPO.
+
+    Creates a new tag in the ARCHIVE or expanded REPO containing
+    the current state of SOURCE_DIR, or updates the expanded REPO
+    to match the current state of SOURCE_DIR, or updates the ARCHIVE file
+    to match the current state of the REPO.
+
+    IMPORTANT:  You cannot use an expanded repository path for both
+    ARCHIVE_OR_REPO and SOURCE_DIR_OR_REPO simultaneously.
+
+    Examples:
+
+    Update archive file to reflect changes to local data files:
+
+        borg-archive update my-data-archive.baz my-data
+
+
+    Update expanded repository to reflect changes to local data files:
+
+        borg-archive update my-expanded-repo my-data
+
+    Update archive to reflect changes to expanded repository:
+
+        borg-archive update my-data-archive.baz my-expanded-repo
+    """
+    from ..core import BorgArchive
+
+    archive_path = canonical_path(archive_or_repo)
+    source_path = canonical_path(source_dir_or_repo)
+    archive_kind = BorgArchive.classify_path(archive_path)
+    source_kind = BorgArchive.classify_path(source_path)
+    if archive_kind == "missing":
+        raise click.BadParameter(
+            f"Path '{archive_path}' does not exist.", param_hint="'ARCHIVE_OR_REPO'"
+        )
+    if source_kind == "missing":
+        raise click.BadParameter(
+            f"Path '{source_path}' does not exist.",
+            param_hint="'SOURCE_DIR_OR_REPO'",
+        )
+    if source_kind == "file":
+        raise click.BadParameter(
+            f"Directory '{source_path}' is a file.",
+            param_hint="'SOURCE_DIR_OR_REPO'",
+        )
+
+    # Enforce that both arguments cannot simultaneously reference a repositories.
+    if archive_kind != "file" and source_kind == "repo_dir":
+        raise ValidationError(
+            "Only one of ARCHIVE_OR_REPO or SOURCE_DIR_OR_REPO may be an expanded repository directory."
+        )
+    # A directory was already classified above, so pass it straight through
+    # as the repository rather than having BorgArchive stat it again.
+    if archive_kind == "file":
+        archive = BorgArchive(archive_path, resolved=True)
+    else:
+        archive = BorgArchive(repo_path=archive_path, resolved=True)
+    with archive:
+        archive.update(
+            source_path,
+            tag,
+            max_compression=max_compression,
+            compression_level=compression_level,
+            resolved=True,
+        )
+
+
+cmd = update
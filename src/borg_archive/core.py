@@ -23,11 +23,14 @@
 """
 
 import os
+import configparser
+import contextlib
 import json
-import shutil
+import stat
 import tempfile
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 import subprocess
 
 from rich.console import Console
@@ -47,11 +50,18 @@ from .exceptions import (
 )
 from .utils import (
     check_required_commands,
+    archiver_for_header,
+    archiver_for_suffix,
+    available_cpus,
     get_best_archiver,
     get_best_compressor,
     run_command,
     run_pipeline,
     ensure_dir,
+    fuse_unmount_command,
+    get_squashfuse,
+    read_archive_header,
+    remove_tree,
 )
 
 console = Console()
@@ -60,6 +70,83 @@ err_console = Console(stderr=True)
 DEBUG = False
 
 
+def _status(message: str):
+    """
+    Return a rich status spinner for `message` when stdout is a terminal, or a
+    no-op context manager otherwise, so piped and CI runs skip the renderer.
+    """
+    if console.is_terminal:
+        return console.status(message)
+    return contextlib.nullcontext()
+
+
+def _progress_args() -> list[str]:
+    """Return borg's `--progress` flag, but only when stderr is a terminal."""
+    return ["--progress"] if err_console.is_terminal else []
+
+
+# Borg compression algorithms that take a level; `lz4` and `none` reject one.
+_LEVELLED_COMPRESSION = ("zstd", "zlib", "lzma")
+
+
+def _compression_spec(compression: str, compression_level: int) -> str:
+    """Return the `borg create --compression` spec for an algorithm and level."""
+    if compression in _LEVELLED_COMPRESSION:
+        return f"{compression},{compression_level}"
+    return compression
+
+
+def _is_repo_config(config_file: Path | str) -> bool:
+    """
+    Return True if `config_file` is a Borg repository config file.
+
+    Borg writes the `[repository]` section header first, so only the start of
+    the file is read.
+    """
+    try:
+        with open(config_file, encoding="utf-8", errors="ignore") as fin:
+            return "[repository]" in fin.read(256)
+    except OSError:
+        return False
+
+
+def _read_repo_id(config_file: Path) -> Optional[str]:
+    """Return the `id` from a Borg repository config file, or None if unreadable."""
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(config_file, encoding="utf-8")
+        repo_id = parser.get("repository", "id").strip()
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+    # Reject anything that could escape the borg state directories below.
+    if not repo_id or not all(c in "0123456789abcdefABCDEF" for c in repo_id):
+        return None
+    return repo_id
+
+
+def _borg_state_dirs(repo_id: str) -> tuple[Path, Path]:
+    """
+    Return the cache and security directories borg keeps for a repository id.
+
+    Mirrors borg's own lookup (`borg.helpers.fs`), so no borg process is needed
+    just to find them: `BORG_CACHE_DIR` / `BORG_SECURITY_DIR` if set, otherwise
+    under `.cache` / `.config` in `BORG_BASE_DIR`.  Only when `BORG_BASE_DIR` is
+    unset are `XDG_CACHE_HOME` / `XDG_CONFIG_HOME` consulted, falling back to
+    `.cache` / `.config` in the home directory.
+    """
+    borg_base_dir = os.environ.get("BORG_BASE_DIR")
+    base_dir = Path(borg_base_dir or Path.home())
+    cache_home = base_dir / ".cache"
+    config_home = base_dir / ".config"
+    if not borg_base_dir:
+        cache_home = Path(os.environ.get("XDG_CACHE_HOME") or cache_home)
+        config_home = Path(os.environ.get("XDG_CONFIG_HOME") or config_home)
+    cache_dir = os.environ.get("BORG_CACHE_DIR") or cache_home / "borg"
+    config_dir = os.environ.get("BORG_CONFIG_DIR") or config_home / "borg"
+    security_dir = os.environ.get("BORG_SECURITY_DIR") or Path(config_dir) / "security"
+    return Path(cache_dir) / repo_id, Path(security_dir) / repo_id
+
+
 class BorgArchive:
     """Main class for handling Borg archive operations."""
 
@@ -67,6 +154,8 @@ class BorgArchive:
         self,
         archive_or_repo_path: Optional[Path] = None,
         repo_path: Optional[Path] = None,
+        path_stat: Optional[os.stat_result] = None,
+        resolved: bool = False,
     ):
         """
         Initialize a BorgArchive instance.
@@ -74,26 +163,43 @@ class BorgArchive:
         Args:
             archive_or_repo_path: Path to the archive file or expanded borg repository (optional)
             repo_path:  Path to an expanded borg repository (use only if supplying both archive and repo). (optional)
+            path_stat: An existing `os.stat` result for `archive_or_repo_path`, used instead of
+                       stat-ing the path again to decide whether it is a repository directory. (optional)
+            resolved: The paths are already absolute and symlink-free (e.g. from the CLI's
+                      `canonical_path`), so they are used as given instead of resolved again. (optional)
         """
+
+        def _resolve(path: Path) -> Path:
+            return Path(path) if resolved else Path(path).resolve()
+
         archive_path = (
-            Path(archive_or_repo_path).resolve() if archive_or_repo_path else None
+            _resolve(archive_or_repo_path) if archive_or_repo_path else None
         )
+        if archive_path is not None and path_stat is not None:
+            is_dir = stat.S_ISDIR(path_stat.st_mode)
+        else:
+            is_dir = archive_path is not None and archive_path.is_dir()
+        borg_dir = _resolve(repo_path) if repo_path else None
         # If a directory was provided in the first arg, assume a repo file.
-        if archive_path is not None and archive_path.is_dir() and repo_path is None:
-            repo_path = archive_or_repo_path
+        # It has been resolved already, so it is used as-is.
+        if archive_path is not None and is_dir and repo_path is None:
+            borg_dir = archive_path
             archive_path = None
         self.archive_path = archive_path
-        self.borg_dir = Path(repo_path).resolve() if repo_path else None
+        self.borg_dir = borg_dir
 
         self.temp_dir = None
         self.is_mounted = False
         self.sqfs_is_mounted = False
+        self.repo_is_readonly = False
+        # Tag names in the repository, oldest first, once `borg list` has run.
+        self._tag_cache: Optional[list[str]] = None
         check_required_commands()
 
     def __enter__(self):
         """Set up temporary working directory."""
         self.temp_dir = (
-            Path(tempfile.mkdtemp()) if not DEBUG else Path(Path.cwd() / ".borg")
+            Path(tempfile.mkdtemp()) if not DEBUG else Path.cwd() / ".borg"
         )
         if self.borg_dir is not None:
             if self.dir_is_repo(self.borg_dir):
@@ -105,6 +211,7 @@ class BorgArchive:
         else:
             self.borg_dir = self.temp_dir / "borg-repo"
             self.borg_dir_is_temp = True
+        self.temp_repo_ready = False
         ensure_dir(self.borg_dir)
         return self
 
@@ -112,14 +219,26 @@ class BorgArchive:
         """Unless the archive has been mounted, clean up the temp directory."""
         if not self.is_mounted and not DEBUG:
             if self.sqfs_is_mounted:
-                try:
-                    run_command(["umount", self.borg_dir])
-                except Exception as e:
-                    err_console.print(f"Unmounting {self.borg_dir} failed: {e}")
-            if self.borg_dir_is_temp:
-                self.__delete_borg_repo()
+                # The repo is the read-only archive itself: clear borg's cache
+                # while it is still reachable, then just unmount it.
+                self.__cleanup_borg_files()
+                if not self.__unmount_squashfs(self.borg_dir):
+                    return
+                self.sqfs_is_mounted = False
+            elif self.borg_dir_is_temp:
+                # The repo lives inside temp_dir, which is removed next.
+                self.__cleanup_borg_files()
             self.__remove_temp_dir()
 
+    def __borg_lock_args(self) -> list[str]:
+        """
+        Return the borg options needed to read the current repository.
+
+        A squashfs archive mounted in place is read-only, so borg cannot create
+        its lock files there; nothing else can be writing to it anyway.
+        """
+        return ["--bypass-lock"] if self.repo_is_readonly else []
+
     def __borg_environ(self) -> dict:
         """Return environment variables needed for borg actions, without mutating os.environ."""
         return {
@@ -132,37 +251,52 @@ class BorgArchive:
         self, repo_dir: Optional[Path] = None, max_compression: bool = True
     ) -> None:
         """Create the compressed archive of the Borg repository, using squashfs if available
-        or tar if squashfs is not available.
+        or tar if squashfs is not available.  A target named `*.sqfs`/`*.squashfs` or
+        `*.tar`/`*.tzst` is always written in that format instead.
 
         Writes to a temporary file in the same directory as the target archive, then atomically
         replaces the target on success so a partial write never destroys the existing archive.
         """
         repo_dir = self.borg_dir if repo_dir is None else repo_dir
-        best_archiver = get_best_archiver()
         target = self.archive_path
+        # A target suffix such as `.sqfs` or `.tar` decides the format, so that
+        # reading the archive later can go by its name alone.
+        best_archiver = archiver_for_suffix(target) or get_best_archiver()
         target.parent.mkdir(parents=True, exist_ok=True)
 
         if best_archiver == "tar":
             compress_cmd, _ = get_best_compressor("tar", max_compression=max_compression)
-            with console.status("Compressing archive..."):
+            with _status("Compressing archive..."):
                 tmp_fd, tmp_path_str = tempfile.mkstemp(
                     dir=target.parent, suffix=".tmp"
                 )
                 tmp_path = Path(tmp_path_str)
                 try:
-                    with os.fdopen(tmp_fd, "wb") as arch_fp:
-                        tmp_fd = None  # ownership transferred to context manager
-                        run_pipeline(
+                    # The compressor writes straight to the temp file's fd;
+                    # no Python file object sits in between.
+                    run_pipeline(
+                        [
+                            # Use --format=pax to ensure consistent tar format,
+                            # and 256 KiB records (-b 512) so the compressor
+                            # is fed in large writes.
                             [
-                                # Use --format=pax to ensure consistent tar format
-                                ["tar", "--format=pax", "-cv", repo_dir.name],
-                                compress_cmd.split(),
+                                "tar",
+                                "-C",
+                                str(repo_dir.parent),
+                                "--format=pax",
+                                "-b",
+                                "512",
+                                "-c",
+                                repo_dir.name,
                             ],
-                            check=True,
-                            stdout=arch_fp,
-                            encoding=None,  # Use binary mode
-                            cwd=repo_dir.parent,
-                        )
+                            [*compress_cmd],
+                        ],
+                        check=True,
+                        stdout=tmp_fd,
+                        encoding=None,  # Use binary mode
+                    )
+                    os.close(tmp_fd)
+                    tmp_fd = None
                     os.replace(tmp_path, target)
                 except Exception as e:
                     raise ArchiveError(f"Failed to create tar archive: {e}")
@@ -171,13 +305,12 @@ class BorgArchive:
                     # the temp file if the atomic replace never happened.
                     if tmp_fd is not None:
                         os.close(tmp_fd)
-                    if tmp_path.exists():
-                        tmp_path.unlink(missing_ok=True)
+                    tmp_path.unlink(missing_ok=True)
         elif best_archiver == "squashfs":
             compress_flags, _ = get_best_compressor(
                 "squashfs", max_compression=max_compression
             )
-            with console.status("Compressing archive..."):
+            with _status("Compressing archive..."):
                 tmp_fd, tmp_path_str = tempfile.mkstemp(
                     dir=target.parent, suffix=".tmp"
                 )
@@ -192,9 +325,15 @@ class BorgArchive:
                             "-quiet",
                             "-noappend",
                             "-no-xattrs",
+                            # Compress blocks on every core, in 1 MiB blocks
+                            # (the default is 128 KiB) for a better ratio and
+                            # faster sequential reads of borg's segment files.
+                            "-processors",
+                            str(available_cpus()),
+                            "-b",
+                            "1048576",
                         ]
-                        + compress_flags.split(),
-                        cwd=repo_dir.parent,
+                        + [*compress_flags],
                     )
                     os.replace(tmp_path, target)
                 except Exception as e:
@@ -202,53 +341,74 @@ class BorgArchive:
                 finally:
                     # Runs even on KeyboardInterrupt: drop the temp file if the
                     # atomic replace never happened.
-                    if tmp_path.exists():
-                        tmp_path.unlink(missing_ok=True)
+                    tmp_path.unlink(missing_ok=True)
         else:
             raise ArchiveError(
                 f"Internal error: Unknown 'best archiver' found: {best_archiver}."
             )
 
     def __extract_compressed_archive(
-        self, archive_path: Optional[Path] = None, repo_dir: Optional[Path] = None
+        self,
+        archive_path: Optional[Path] = None,
+        repo_dir: Optional[Path] = None,
+        archiver: Optional[str] = None,
     ) -> None:
         """
         Extract the compressed archive to restore a borg repository directory.
         Works with SquashFS compressed filesystems or tar archives.
+
+        `archiver` is the archive's already-detected format, if the caller has it.
         """
-        archive_path = (
-            Path(archive_path) if archive_path is not None else self.archive_path
-        )
-        repo_dir = Path(repo_dir) if repo_dir is not None else self.borg_dir
+        archive_path = archive_path if archive_path is not None else self.archive_path
+        repo_dir = repo_dir if repo_dir is not None else self.borg_dir
 
-        best_archiver = get_best_archiver(archive_path)
+        best_archiver = (
+            archiver if archiver is not None else get_best_archiver(archive_path)
+        )
+        try:
+            self.__expand_as(best_archiver, archive_path, repo_dir)
+        except ExpandError:
+            # Earlier versions ignored the suffix when choosing the format, so
+            # an archive named e.g. `data.tar` may really be squashfs; when the
+            # suffix-chosen format fails, go by the magic bytes instead.
+            if archiver_for_suffix(archive_path) is None:
+                raise
+            actual = archiver_for_header(read_archive_header(archive_path))
+            if actual == best_archiver:
+                raise
+            self.__expand_as(actual, archive_path, repo_dir)
+
+    def __expand_as(
+        self, best_archiver: str, archive_path: Path, repo_dir: Path
+    ) -> None:
+        """Extract `archive_path` into `repo_dir` as a `best_archiver` archive."""
         if best_archiver == "tar":
-            # Extract the compressed tarfile
+            # Extract the compressed tarfile.  The decompressor reads the archive
+            # itself and streams straight into tar, so no uncompressed tarball is
+            # ever written; only the repository that borg needs lands on disk.
             _, decompress_cmd = get_best_compressor()
-            with console.status("Extracting archive..."):
+            with _status("Extracting archive..."):
                 try:
-                    with open(archive_path, "rb") as arch_in:
-                        run_pipeline(
+                    run_pipeline(
+                        [
+                            [*decompress_cmd, "-c", str(archive_path)],
                             [
-                                decompress_cmd.split(),
-                                [
-                                    "tar",
-                                    "-xf",
-                                    "-",
-                                    "-C",
-                                    str(repo_dir),
-                                    "--strip-components=1",
-                                ],
+                                "tar",
+                                "-xf",
+                                "-",
+                                "-C",
+                                str(repo_dir),
+                                "--strip-components=1",
                             ],
-                            stdin=arch_in,
-                            check=True,
-                            encoding=None,
-                        )
+                        ],
+                        check=True,
+                        encoding=None,
+                    )
                 except Exception as e:
                     raise ExpandError(f"Failed to expand tar archive: {e}")
         elif best_archiver == "squashfs":
             # Extract squashfs archive
-            with console.status("Extracting archive..."):
+            with _status("Extracting archive..."):
                 try:
                     run_command(
                         [
@@ -256,6 +416,8 @@ class BorgArchive:
                             "-f",
                             "-no-progress",
                             "-quiet",
+                            "-processors",
+                            str(available_cpus()),
                             "-dest",
                             str(repo_dir),
                             str(archive_path),
@@ -264,96 +426,126 @@ class BorgArchive:
                 except Exception as e:
                     raise ExpandError(f"Failed to expand squashfs archive: {e}")
 
+    def __mount_squashfs_ro(
+        self,
+        archive_path: Optional[Path] = None,
+        mount_point: Optional[Path] = None,
+        archiver: Optional[str] = None,
+    ) -> bool:
+        """
+        Mount a squashfs archive read-only on the temporary repo directory with
+        squashfuse, so borg reads only the blocks it needs instead of the whole
+        archive being unpacked first.
+
+        `archiver` is the archive's already-detected format, if the caller has it.
+
+        Returns:
+            bool: True if the archive is now mounted; False if it is not a squashfs
+                archive, no squashfuse is installed, or the mount failed (e.g. no
+                FUSE), in which case the caller should extract it instead
+        """
+        archive_path = archive_path if archive_path is not None else self.archive_path
+        mount_point = mount_point if mount_point is not None else self.borg_dir
+        squashfuse = get_squashfuse()
+        if squashfuse is None:
+            return False
+        if archiver is None:
+            archiver = get_best_archiver(archive_path)
+        if archiver != "squashfs":
+            return False
+        result = run_command(
+            [squashfuse, "-o", "ro", str(archive_path), str(mount_point)],
+            check=False,
+            suppress_stderr=True,
+        )
+        if result.returncode != 0:
+            return False
+        self.sqfs_is_mounted = True
+        self.repo_is_readonly = True
+        return True
+
+    def __prepare_temp_repo(self, read_only: bool = False) -> None:
+        """
+        Expand the archive into the temporary repo directory, unless that already
+        happened in this context.  Does nothing when working on an expanded repo.
+
+        Keeping track of this lets a single BorgArchive context serve several
+        operations (e.g. `list_tags` then `extract`) while paying for the
+        expansion only once.
+
+        Args:
+            read_only: The caller only reads the repository, so a squashfs archive
+                       may be mounted in place rather than extracted
+        """
+        if self.sqfs_is_mounted and not read_only:
+            # An earlier read-only operation mounted the archive in place; the
+            # caller needs a writable copy, so swap the mount for an extraction.
+            if not self.__unmount_squashfs(self.borg_dir):
+                raise ExpandError(f"Failed to unmount squashfs at {self.borg_dir}")
+            self.sqfs_is_mounted = False
+            self.repo_is_readonly = False
+            self.temp_repo_ready = False
+        if self.borg_dir_is_temp and not self.temp_repo_ready:
+            # Detect the format once for both the mount attempt and the fallback.
+            archiver = get_best_archiver(self.archive_path)
+            if not (read_only and self.__mount_squashfs_ro(archiver=archiver)):
+                self.__extract_compressed_archive(archiver=archiver)
+            self.temp_repo_ready = True
+
     def __remove_temp_dir(self, tmp_dir_path: Optional[Path] = None) -> None:
         """Clean up temporary directory."""
         if tmp_dir_path is None:
             tmp_dir_path = self.temp_dir
-        tmp_dir_path = Path(tmp_dir_path)
-        if tmp_dir_path.exists():
-            shutil.rmtree(tmp_dir_path)
+        remove_tree(tmp_dir_path)
 
     def __cleanup_borg_files(self, tmp_repo_path: Optional[Path] = None) -> None:
         """Clean up cache and security files associated with the repository."""
 
         tmp_repo_path = tmp_repo_path if tmp_repo_path is not None else self.borg_dir
-
-        try:
-            result = run_command(
-                ["borg", "info", "--error", "--json", tmp_repo_path],
-                capture_output=True,
-                encoding="utf-8",
-                check=False,
-                suppress_stderr=True,
-                env=self.__borg_environ(),
-            )
-
-            if result.returncode != 0:
-                if DEBUG:
-                    console.print(
-                        f"[yellow]Warning:[/yellow] Failed to get repository info: {result.stderr}"
-                    )
-                return
-
-            info = json.loads(result.stdout)
-
-            # Clean up cache directory
-            if "cache" in info and "path" in info["cache"]:
-                cache_path = Path(info["cache"]["path"])
-                if cache_path.exists():
-                    shutil.rmtree(cache_path)
-                    if DEBUG:
-                        console.print(f"Removed cache directory: {cache_path}")
-
-            # Clean up security directory
-            if "security_dir" in info:
-                security_dir = Path(info["security_dir"])
-                if security_dir.exists():
-                    shutil.rmtree(security_dir)
-                    if DEBUG:
-                        console.print(f"Removed security directory: {security_dir}")
-
-        except Exception as e:
+        repo_id = _read_repo_id(tmp_repo_path / "config")
+        if repo_id is None:
             if DEBUG:
                 console.print(
-                    f"[yellow]Warning:[/yellow] Failed to clean up repository files: {e}"
+                    f"[yellow]Warning:[/yellow] No repository id found in {tmp_repo_path}"
                 )
+            return
+
+        for state_dir in _borg_state_dirs(repo_id):
+            remove_tree(state_dir)
+            if DEBUG:
+                console.print(f"Removed borg state directory: {state_dir}")
 
     def __delete_borg_repo(self):
         """Delete the temporary or expanded borg repo and associated files."""
         # Clean up cache and security files first
         self.__cleanup_borg_files()
 
-        # Delete the borg repo
-        try:
-            run_command(
-                ["borg", "delete", "--error", "--force", self.borg_dir],
-                check=False,
-                suppress_stderr=True,
-                env=self.__borg_environ(),
-            )
-        except Exception as e:
-            if DEBUG:
-                console.print(
-                    f"[red]Error:[/red] Failed to delete the temporary repository: {e}"
-                )
+        # Then the repository itself.  This is all `borg delete` would do for a
+        # repo we are discarding anyway, without starting borg (or its
+        # "type YES" confirmation prompt).
+        remove_tree(self.borg_dir)
 
-    def __unmount_squashfs(self, mounted_squashfs: Path | str):
+    def __unmount_squashfs(self, mounted_squashfs: Path | str) -> bool:
+        """Unmount a squashfuse mount; returns False if it is still mounted."""
         try:
-            run_command(
-                ["umount", "-t", "squashfs", mounted_squashfs],
+            result = run_command(
+                fuse_unmount_command(mounted_squashfs),
                 check=False,
                 suppress_stderr=True,
             )
         except Exception as e:
             err_console.print(f"Failed to unmount squashfs at {mounted_squashfs}: {e}")
+            return False
+        return result.returncode == 0
 
     @staticmethod
     def dir_is_repo(repo_path: Path) -> bool:
         """
         Check if a directory is a Borg repository.
 
-        Uses a read-only file-based check (looks for the repo config marker) so it
-        never mutates the directory being tested.
+        Uses a read-only file-based check (looks for the repo config marker and the
+        `data` directory) so it never mutates the directory being tested, and
+        never has to start borg.
 
         Note:
             This method is designed to be fast to reject non-Borg directories.
@@ -367,12 +559,48 @@ class BorgArchive:
         """
         repo_path = Path(repo_path)
         config_file = repo_path / "config"
-        if not config_file.is_file():
+        if not config_file.is_file() or not (repo_path / "data").is_dir():
             return False
+        return _is_repo_config(config_file)
+
+    @staticmethod
+    def classify_path(
+        path: Path,
+    ) -> Literal["file", "repo_dir", "plain_dir", "missing"]:
+        """
+        Classify a path as an archive file, a Borg repository directory, a plain
+        directory, or missing.
+
+        A single `os.scandir` both tests whether the path is a directory and finds
+        the repository marker entries (`config` and `data`), so slow or remote
+        filesystems see one round-trip instead of several stats.  Like
+        `dir_is_repo`, this is a fast check rather than a `borg check`.
+
+        Args:
+            path: Path to classify
+
+        Returns:
+            "file" for anything that is not a directory, "repo_dir" for a Borg
+            repository, "plain_dir" for any other directory, or "missing"
+        """
         try:
-            return "[repository]" in config_file.read_text(encoding="utf-8")
-        except OSError:
-            return False
+            with os.scandir(path) as it:
+                entries = {entry.name: entry for entry in it}
+        except FileNotFoundError:
+            return "missing"
+        except NotADirectoryError:
+            return "file"
+        except PermissionError:
+            return "plain_dir"
+        config = entries.get("config")
+        if (
+            config is not None
+            and "data" in entries
+            and config.is_file()
+            and _is_repo_config(config.path)
+        ):
+            return "repo_dir"
+        return "plain_dir"
 
     def create(
         self,
@@ -381,6 +609,8 @@ class BorgArchive:
         expanded: bool = False,
         borg_options: Optional[list[str]] = None,
         max_compression: bool = False,
+        compression: str = "zstd",
+        compression_level: int = 3,
     ) -> None:
         """
         Create a new archive.
@@ -392,7 +622,11 @@ class BorgArchive:
             borg_options: Additional borg options
             max_compression: If True, apply maximum compression to the outer archive layer.
                              Default is False (light outer compression, since borg already
-                             compresses internally with zstd,9).
+                             compresses internally).
+            compression: Compression algorithm borg uses for the data chunks
+            compression_level: Level for `compression`; zstd's default of 3 is several
+                               times faster than 9 for a slightly larger repository.
+                               Ignored for `lz4` and `none`, which take no level.
         """
         source_dir = Path(source_dir)
         if not source_dir.is_dir():
@@ -424,9 +658,9 @@ class BorgArchive:
                     "borg",
                     "create",
                     "--compression",
-                    "zstd,9",
+                    _compression_spec(compression, compression_level),
                     "--error",
-                    "--progress",
+                    *_progress_args(),
                     f"{self.borg_dir}::{tag}",
                     source_dir.name,
                 ],
@@ -435,11 +669,13 @@ class BorgArchive:
             )
         except Exception as e:
             raise CreationError(f"Failed to create repository: {e}")
+        self._tag_cache = [tag]
         if not expanded:
             try:
                 self.__create_compressed_archive(max_compression=max_compression)
             except Exception as e:
                 raise CreationError(f"Failed to create archive file: {e}")
+            self.temp_repo_ready = True
 
     def collapse(self, repo_dir: Path, retain_repo=False, max_compression: bool = False) -> None:
         """
@@ -461,6 +697,8 @@ class BorgArchive:
                 f'Failed to collapse repository "{str(repo_dir)}": Not a valid repository directory.'
             )
         self.borg_dir = repo_dir
+        # The repo is the caller's; __exit__ must not treat it as temporary.
+        self.borg_dir_is_temp = False
         try:
             self.__create_compressed_archive(repo_dir, max_compression=max_compression)
         except Exception as e:
@@ -468,7 +706,6 @@ class BorgArchive:
         # Only delete the source repo after the new archive is fully written
         if not retain_repo:
             self.__delete_borg_repo()
-            self.__remove_temp_dir(repo_dir)
 
     def expand(self, repo_dir: Path) -> None:
         """
@@ -516,8 +753,7 @@ class BorgArchive:
         ensure_dir(output_dir)
 
         try:
-            if self.borg_dir_is_temp:
-                self.expand(self.borg_dir)
+            self.__prepare_temp_repo(read_only=True)
         except ExpandError as e:
             raise ExtractError(f"Failed to extract archive: {e}")
 
@@ -527,7 +763,14 @@ class BorgArchive:
             if not tag:
                 tag = self.get_most_recent_tag()
             run_command(
-                ["borg", "extract", "--error", "--progress", f"{self.borg_dir}::{tag}"],
+                [
+                    "borg",
+                    "extract",
+                    "--error",
+                    *_progress_args(),
+                    *self.__borg_lock_args(),
+                    f"{self.borg_dir}::{tag}",
+                ],
                 encoding="utf-8",  # Use text mode for borg output
                 suppress_stderr=True,
                 cwd=output_dir,
@@ -586,24 +829,43 @@ class BorgArchive:
 
         Returns:
             list: List of tags (with timestamps if full_output=True)
+
+        Note:
+            The plain tag names are remembered for the rest of the context and
+            kept current by `create` and `update`, so only the first call (and
+            any `full_output` call) runs `borg list`.
         """
-        # List borg archives
-        format_str = "{archive:<36} {time}{NL}" if full_output else "{archive}{NL}"
+        if not full_output and self._tag_cache is not None:
+            return list(self._tag_cache)
+        # List borg archives: names only (`--short`) unless timestamps are wanted,
+        # in which case the structured `--json` listing is parsed.
         proc1 = run_command(
             [
                 "borg",
                 "list",
                 "--error",
-                "--format",
-                format_str,
+                "--json" if full_output else "--short",
+                *self.__borg_lock_args(),
                 str(self.borg_dir),
             ],
             capture_output=True,
-            encoding="utf-8",  # Use text mode for borg output
             suppress_stderr=True,
             env=self.__borg_environ(),
         )
-        return proc1.stdout.splitlines()
+        # The output is captured as bytes: json.loads() takes them as-is, and
+        # only the names themselves are decoded.
+        if not full_output:
+            tags = proc1.stdout.decode("utf-8").splitlines()
+            self._tag_cache = list(tags)
+            return tags
+        archives = json.loads(proc1.stdout)["archives"]
+        self._tag_cache = [archive["name"] for archive in archives]
+        # Same layout as borg's own "{archive:<36} {time}" listing.
+        return [
+            f"{archive['name']:<36} "
+            f"{datetime.fromisoformat(archive['time']).strftime('%a, %Y-%m-%d %H:%M:%S')}"
+            for archive in archives
+        ]
 
     def list_tags(self) -> None:
         """
@@ -616,12 +878,11 @@ class BorgArchive:
             ArchiveError: If there's an error reading the archive or repository
         """
 
-        # Extract the compressed tarfile unless we are already expanded:
-        if self.borg_dir_is_temp:
-            try:
-                self.__extract_compressed_archive()
-            except Exception as e:
-                raise ArchiveError(f"Failed to read archive: {e}")
+        # Extract (or mount) the archive unless we are already expanded:
+        try:
+            self.__prepare_temp_repo(read_only=True)
+        except Exception as e:
+            raise ArchiveError(f"Failed to read archive: {e}")
         try:
             # List borg archives
             for line in self.get_tag_list(full_output=True):
@@ -651,10 +912,10 @@ class BorgArchive:
         if self.borg_dir_is_temp:
             # Save temp dir path for unmounting
             (mount_dir / ".borg-repo").write_text(str(self.borg_dir))
-            try:
-                self.__extract_compressed_archive()
-            except Exception as e:
-                raise MountError(f"Failed to prepare archive: {e}")
+        try:
+            self.__prepare_temp_repo(read_only=True)
+        except Exception as e:
+            raise MountError(f"Failed to prepare archive: {e}")
 
         # Mount archive
         try:
@@ -662,7 +923,14 @@ class BorgArchive:
             if not tag:
                 tag = self.get_most_recent_tag()
             run_command(
-                ["borg", "mount", "--error", f"{self.borg_dir}::{tag}", str(mount_dir)],
+                [
+                    "borg",
+                    "mount",
+                    "--error",
+                    *self.__borg_lock_args(),
+                    f"{self.borg_dir}::{tag}",
+                    str(mount_dir),
+                ],
                 encoding="utf-8",  # Use text mode for borg output
                 env=self.__borg_environ(),
             )
@@ -693,17 +961,22 @@ class BorgArchive:
             )
             # If the mount was from a temporary dir, there will be a ".borg-repo"
             # path cache file there now.
-            if (mount_dir / ".borg-repo").exists():
+            repo_path_file = mount_dir / ".borg-repo"
+            try:
                 # Get the path to the temporary Borg repo that was mounted:
-                mounted_repo = Path((mount_dir / ".borg-repo").read_text())
+                mounted_repo = Path(repo_path_file.read_text())
+            except FileNotFoundError:
+                mounted_repo = None
+            if mounted_repo is not None:
+                # Clean it from caches while its config is still readable; it
+                # may be a squashfs mount that is about to go away.
+                self.__cleanup_borg_files(mounted_repo)
                 # Try unmounting in case it is squashfs.
                 self.__unmount_squashfs(mounted_repo)
-                # Clean it from caches
-                self.__cleanup_borg_files(mounted_repo)
                 # And remove that directory.
                 self.__remove_temp_dir(mounted_repo)
                 # Remove the repo path cache file
-                (mount_dir / ".borg-repo").unlink()
+                repo_path_file.unlink(missing_ok=True)
             console.print("Unmounted archive")
         except Exception as e:
             raise MountError(f"Failed to unmount archive: {e}")
@@ -713,6 +986,9 @@ class BorgArchive:
         source_dir_or_repo: Path,
         tag: Optional[str] = None,
         max_compression: bool = False,
+        compression: str = "zstd",
+        compression_level: int = 3,
+        resolved: bool = False,
     ) -> None:
         """
         Update archive with changes from the raw dataset or from an expanded repository.
@@ -721,13 +997,19 @@ class BorgArchive:
             source_dir_or_repo: Directory containing changes or an expanded repository
             tag: Tag for the update (default: auto-increment)
             max_compression: If True, apply maximum compression to the outer archive layer.
+            compression: Compression algorithm borg uses for the new data chunks
+            compression_level: Level for `compression` (see `create`)
+            resolved: `source_dir_or_repo` is already absolute and symlink-free, so it is
+                      not resolved again
 
         Raises:
             ValidationError: If the source directory doesn't exist
             UpdateError: If there's an error updating the archive
             DuplicateTagException: If the provided tag already exists in the repository
         """
-        source_dir_or_repo = Path(source_dir_or_repo).resolve()
+        source_dir_or_repo = Path(source_dir_or_repo)
+        if not resolved:
+            source_dir_or_repo = source_dir_or_repo.resolve()
         if not source_dir_or_repo.is_dir():
             raise ValidationError(
                 f"Source directory '{source_dir_or_repo}' does not exist"
@@ -737,16 +1019,15 @@ class BorgArchive:
         if updating_archive_from_repo:
             self.borg_dir = source_dir_or_repo
             self.borg_dir_is_temp = False
+            self._tag_cache = None
 
         updating_archive = self.archive_path is not None
 
-        # If we are using a temporary repo dir:
-        if self.borg_dir_is_temp:
-            # Extract the compressed tarfile
-            try:
-                self.__extract_compressed_archive()
-            except Exception as e:
-                raise UpdateError(f"Failed to prepare archive: {e}")
+        # If we are using a temporary repo dir, extract the compressed archive
+        try:
+            self.__prepare_temp_repo()
+        except Exception as e:
+            raise UpdateError(f"Failed to prepare archive: {e}")
 
         try:
             # If we are not updating the tar directly from an expanded repo,
@@ -768,9 +1049,9 @@ class BorgArchive:
                         "borg",
                         "create",
                         "--compression",
-                        "zstd,9",
+                        _compression_spec(compression, compression_level),
                         "--error",
-                        "--progress",
+                        *_progress_args(),
                         f"{self.borg_dir}::{tag}",
                         source_dir_or_repo.name,
                     ],
@@ -779,9 +1060,13 @@ class BorgArchive:
                     cwd=source_dir_or_repo.parent,
                     env=self.__borg_environ(),
                 )
+                if self._tag_cache is not None:
+                    self._tag_cache.append(tag)
 
             if updating_archive:
                 # Create new compressed tarfile
                 self.__create_compressed_archive(max_compression=max_compression)
         except Exception as e:
+            # A failed `borg create` may or may not have left an archive behind.
+            self._tag_cache = None
             raise UpdateError(f"Failed to update archive: {e}")
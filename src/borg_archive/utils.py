@@ -23,76 +23,299 @@
  CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
-import shutil, sys
+import os
+import shlex
+import shutil, signal, stat, sys
 import subprocess
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Optional, Tuple, Union, TextIO, BinaryIO
+from typing import Iterable, Optional, Tuple, Union, TextIO, BinaryIO
+
+try:
+    import fcntl
+except ImportError:  # Not on this platform (e.g. Windows); pipes keep their size.
+    fcntl = None
 
 from rich.console import Console
+from rich.markup import escape
 from rich.prompt import Confirm
 
 from .exceptions import CommandNotFoundError
 
 console = Console()
+err_console = Console(stderr=True)
+
+# Buffer size requested for the pipes between pipeline stages.
+PIPE_SIZE = 1 << 20
+
+
+@cache
+def _which(cmd: str) -> Optional[str]:
+    """
+    `shutil.which`, memoized: every single-command PATH probe in this module goes
+    through here, so each command is looked up at most once per process.
+
+    Call `_which.cache_clear()` after changing PATH to look again.
+    """
+    return shutil.which(cmd)
+
+
+def _scan_path_for(names: set[str], path: Optional[str] = None) -> dict[str, str]:
+    """
+    Find several commands with a single walk over PATH.
+
+    Each PATH directory is listed once with `os.scandir`, rather than every
+    name being stat-ed in every directory as separate `shutil.which` calls would.
+
+    Args:
+        names: Command names to look for
+        path: PATH-style directory list to search (default: the PATH environment variable)
+
+    Returns:
+        dict[str, str]: Full path of the first executable match for each name that
+            was found; missing names are simply absent
+    """
+    found: dict[str, str] = {}
+    remaining = set(names)
+    if path is None:
+        path = os.environ.get("PATH", os.defpath)
+    for directory in path.split(os.pathsep):
+        if not remaining:
+            break
+        try:
+            entries = os.scandir(directory or os.curdir)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if (
+                    entry.name in remaining
+                    and not entry.is_dir()
+                    and os.access(entry.path, os.X_OK)
+                ):
+                    found[entry.name] = entry.path
+                    remaining.discard(entry.name)
+    return found
+
+
+@lru_cache(maxsize=4)
+def _missing_required_commands(path: str) -> Optional[str]:
+    """
+    Look for the required commands on `path` (one PATH walk).
+
+    Returns the error message for whatever is missing, or None if all are
+    present; returning rather than raising lets lru_cache remember failures too.
+    """
+    required_commands = ["borg", "tar", "zstd"]
+    found = _scan_path_for(set(required_commands), path)
+    missing = [cmd for cmd in required_commands if cmd not in found]
+    if len(missing) == 1:
+        return f"Required command '{missing[0]}' not found in PATH"
+    if missing:
+        names = ", ".join(f"'{cmd}'" for cmd in missing)
+        return f"Required commands {names} not found in PATH"
+    return None
 
 
 def check_required_commands() -> None:
     """
     Check if all required commands (borg, tar, zstd) are available.
     Raises CommandNotFoundError if any required command is missing.
+
+    All three are found in one pass over PATH, and the outcome (success or the
+    missing commands) is cached per PATH value, so repeated checks are free
+    until PATH changes.
     """
-    required_commands = ["borg", "tar", "zstd"]
-    for cmd in required_commands:
-        if not shutil.which(cmd):
-            raise CommandNotFoundError(f"Required command '{cmd}' not found in PATH")
+    message = _missing_required_commands(os.environ.get("PATH", os.defpath))
+    if message is not None:
+        raise CommandNotFoundError(message)
+
+
+def available_cpus() -> int:
+    """
+    Number of CPUs this process may run on, for sizing parallel compressors.
+
+    Uses the scheduler affinity mask where the platform has one (so a job
+    pinned to a few cores by cgroups or `taskset` is not oversubscribed), and
+    falls back to `os.cpu_count()` elsewhere (e.g. macOS).
+
+    Returns:
+        int: At least 1
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def _build_compressor_table() -> dict[str, tuple]:
+    """
+    Build the table `get_best_compressor` picks from.
+
+    For each archiver, an ordered tuple of (tool that must be on PATH,
+    compress argv, decompress argv); "{level}" in a compress argv is filled in
+    with the compression level.
+    """
+    cpus = str(available_cpus())
+    return {
+        "tar": (
+            ("zstd", ("zstd", "-T0", "-{level}"), ("zstd", "-d")),
+            ("pigz", ("pigz", "-p", cpus, "-{level}"), ("pigz", "-d")),
+            ("gzip", ("gzip", "-{level}"), ("gzip", "-d")),
+        ),
+        "squashfs": (
+            ("zstd", ("-comp", "zstd", "-Xcompression-level", "{level}"), ("-comp", "zstd")),
+            ("gzip", ("-comp", "gzip", "-Xcompression-level", "{level}"), ("-comp", "gzip")),
+        ),
+    }
+
+
+_COMPRESSOR_TABLE = _build_compressor_table()
+
+
+def refresh() -> None:
+    """
+    Forget every cached tool lookup, e.g. after PATH or the CPU affinity changes,
+    so the next call re-probes the system.
+    """
+    global _COMPRESSOR_TABLE
+    _which.cache_clear()
+    _missing_required_commands.cache_clear()
+    _COMPRESSOR_TABLE = _build_compressor_table()
 
 
-def get_best_compressor(archiver: str = "tar", max_compression: bool = True) -> Tuple[str, str]:
+def get_best_compressor(
+    archiver: str = "tar", max_compression: bool = True
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
     """
     Determine the best available compression command and its decompression counterpart.
 
+    The commands are returned already split into argv form, so callers can add
+    arguments (such as a path containing spaces) without any shell-style
+    splitting.  Where the tool supports it the compressor is told to use every
+    available CPU, since tar|compress is bound by the compressor.  The candidates
+    come from `_COMPRESSOR_TABLE`; call `refresh()` to re-probe them.
+
     Args:
         archiver: The archiver to get compression commands for, either 'tar' (default) or 'squashfs'
         max_compression: If True, use maximum compression (level 9); if False, use light
                          compression (level 1) suitable for already-compressed borg data.
 
     Returns:
-        Tuple[str, str]: A tuple of (compress_cmd, decompress_cmd)
+        Tuple[Tuple[str, ...], Tuple[str, ...]]: A tuple of (compress_cmd, decompress_cmd);
+            for 'squashfs' these are the `-comp ...` flags for mksquashfs/unsquashfs
 
     Note:
         Prefers compression tools in this order:
-        - For tar: zstd > pigz > gzip
+        - For tar: zstd (multithreaded) > pigz (parallel gzip) > gzip
         - For squashfs: zstd > gzip
 
     Raises:
         CommandNotFoundError: If no supported compression command is found
         RuntimeError: If an invalid archiver type is specified
     """
-    level = "9" if max_compression else "1"
-    if archiver == "tar":
-        if shutil.which("zstd"):
-            return f"zstd -{level}", "zstd -d"
-        elif shutil.which("pigz"):
-            return f"pigz -{level}", "pigz -d"
-        elif shutil.which("gzip"):
-            return f"gzip -{level}", "gzip -d"
-        else:
-            raise CommandNotFoundError(
-                "No supported compression command found (tried: zstd, pigz, gzip)"
-            )
-    elif archiver == "squashfs":
-        if shutil.which("zstd"):
-            return f"-comp zstd -Xcompression-level {level}", "-comp zstd"
-        elif shutil.which("gzip"):
-            return f"-comp gzip -Xcompression-level {level}", "-comp gzip"
-        else:
-            raise CommandNotFoundError(
-                "No supported compression command found (tried: zstd, gzip)"
-            )
-    else:
+    if archiver not in _COMPRESSOR_TABLE:
         raise RuntimeError(
             f"Bad archiver type in `for_archiver`: {archiver} (must be 'tar' or 'squashfs')."
         )
+    level = "9" if max_compression else "1"
+    candidates = _COMPRESSOR_TABLE[archiver]
+    for tool, compress_cmd, decompress_cmd in candidates:
+        if _which(tool):
+            return tuple(arg.format(level=level) for arg in compress_cmd), decompress_cmd
+    tried = ", ".join(tool for tool, _, _ in candidates)
+    raise CommandNotFoundError(
+        f"No supported compression command found (tried: {tried})"
+    )
+
+
+def _has_mksquashfs() -> bool:
+    """Return True if `mksquashfs` is on PATH."""
+    return bool(_which("mksquashfs"))
+
+
+# Archive signatures as (archiver, offset, magic bytes), most common format first.
+# Both outer formats tar can be compressed with are listed so a header is
+# positively identified rather than falling through to the default.
+_MAGICS = (
+    ("squashfs", 0, b"hsqs"),
+    ("tar", 0, b"\x28\xb5\x2f\xfd"),  # zstd frame
+    ("tar", 0, b"\x1f\x8b"),  # gzip member
+)
+
+# Bytes read from the start of an archive to detect its format.
+ARCHIVE_HEADER_SIZE = max(offset + len(magic) for _, offset, magic in _MAGICS)
+
+
+def read_archive_header(file_path: Path) -> bytes:
+    """
+    Read the first ARCHIVE_HEADER_SIZE bytes of an archive file.
+
+    A bare descriptor and one positional `os.pread` are used, with no file
+    object or buffer around them; platforms without `pread` fall back to an
+    unbuffered `open`.  The open itself is the existence check, and an `fstat`
+    on the open descriptor rejects anything that is not a regular file (so a
+    FIFO or device is never read from), instead of a separate `is_file()` stat.
+
+    Args:
+        file_path: Archive to read
+
+    Returns:
+        bytes: The header, or b"" if the path is not a readable file
+    """
+    try:
+        if not hasattr(os, "pread"):
+            with open(file_path, "rb", buffering=0) as fin:
+                return fin.read(ARCHIVE_HEADER_SIZE)
+        fd = os.open(file_path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            if not stat.S_ISREG(os.fstat(fd).st_mode):
+                return b""
+            return os.pread(fd, ARCHIVE_HEADER_SIZE, 0)
+        finally:
+            os.close(fd)
+    except OSError:
+        return b""
+
+
+# File name suffixes that name an archive format outright.  Archives that this
+# tool creates with one of these suffixes are always written in that format
+# (see `archiver_for_suffix`), so detection can trust them without reading.
+# `.tgz` is deliberately absent: tarballs are written with zstd, not gzip.
+_SUFFIX_ARCHIVERS = {
+    ".sqfs": "squashfs",
+    ".squashfs": "squashfs",
+    ".tar": "tar",
+    ".tzst": "tar",
+}
+
+
+def archiver_for_suffix(file_path: Path) -> Optional[str]:
+    """
+    Return the archiver a file name's suffix calls for, if it names one.
+
+    Args:
+        file_path: Archive path
+
+    Returns:
+        Optional[str]: 'tar', 'squashfs', or None for any other suffix (e.g. `.baz`)
+    """
+    return _SUFFIX_ARCHIVERS.get(Path(file_path).suffix.lower())
+
+
+def archiver_for_header(header: bytes) -> str:
+    """
+    Return the archiver whose magic bytes an archive header starts with.
+
+    Args:
+        header: The archive's first bytes (see `read_archive_header`)
+
+    Returns:
+        str: Either 'tar' or 'squashfs'; 'tar' if no signature matches
+    """
+    for archiver, offset, magic in _MAGICS:
+        if header[offset : offset + len(magic)] == magic:
+            return archiver
+    return "tar"
 
 
 def get_best_archiver(file_path: Optional[Path] = None) -> str:
@@ -106,31 +329,103 @@ def get_best_archiver(file_path: Optional[Path] = None) -> str:
     Returns:
         str: Either 'tar' or 'squashfs'
     """
-    # If they are asking about an existing archive, try to detect the format.
-    is_squashfs = False
-    if file_path is not None and file_path.is_file():
-        with open(file_path, "rb") as fin:
-            if fin.read(4) == b"hsqs":
-                is_squashfs = True
-    has_squashfs = bool(shutil.which("mksquashfs"))
-
+    # If they are asking about an existing archive, detect the format: from its
+    # suffix when that is conclusive, otherwise from its magic bytes.
     if file_path is not None:
-        if is_squashfs:
-            return "squashfs"
-    elif has_squashfs:
-        return "squashfs"
-    return "tar"
+        archiver = archiver_for_suffix(file_path)
+        if archiver is not None:
+            return archiver
+        return archiver_for_header(read_archive_header(file_path))
+    return "squashfs" if _has_mksquashfs() else "tar"
 
 
+def get_squashfuse() -> Optional[str]:
+    """
+    Find a FUSE driver that can mount a squashfs archive without root.
+
+    Returns:
+        Optional[str]: 'squashfuse_ll' (preferred, lower overhead) or 'squashfuse',
+            or None if neither is installed
+    """
+    for cmd in ("squashfuse_ll", "squashfuse"):
+        if _which(cmd):
+            return cmd
+    return None
+
+
+def fuse_unmount_command(mount_point: Union[Path, str]) -> list[str]:
+    """
+    Build the command that unmounts a FUSE filesystem as an unprivileged user.
+
+    Args:
+        mount_point: Directory the filesystem is mounted on
+
+    Returns:
+        list[str]: `fusermount3 -u` or `fusermount -u` on Linux, plain `umount`
+            elsewhere (e.g. macFUSE)
+    """
+    for cmd in ("fusermount3", "fusermount"):
+        if _which(cmd):
+            return [cmd, "-u", str(mount_point)]
+    return ["umount", str(mount_point)]
+
+
+def _preview(output: Union[str, bytes], n: int = 4096) -> str:
+    """
+    Return at most the first `n` characters (or bytes) of a command's output as
+    text, so a failing command with huge or binary output can't flood the error
+    report; bytes are decoded with replacement characters.
+    """
+    if isinstance(output, bytes):
+        return output[:n].decode("utf-8", "replace")
+    return output[:n]
+
+
+def _report_failure(
+    title: str,
+    cmd: list[str],
+    stdout: Optional[Union[str, bytes]],
+    stderr: Optional[Union[str, bytes]],
+) -> None:
+    """
+    Report a failed command on stderr, with rich markup when stderr is a terminal
+    and as plain text otherwise, so scripted runs skip the markup parsing entirely.
+
+    Only runs on the error path, so the quoted command line and output previews
+    are built here rather than by the callers.
+    """
+    command_line = shlex.join(str(arg) for arg in cmd)
+    outputs = [
+        (label, _preview(output))
+        for label, output in (("stdout", stdout), ("stderr", stderr))
+        if output
+    ]
+    if err_console.is_terminal:
+        err_console.print(f"[red]{title}:[/red] {escape(command_line)}")
+        for label, text in outputs:
+            color = "yellow" if label == "stdout" else "red"
+            err_console.print(f"[{color}]{label}:[/{color}]", escape(text))
+        return
+    lines = [f"{title}: {command_line}\n"]
+    lines.extend(f"{label}: {text.rstrip()}\n" for label, text in outputs)
+    sys.stderr.write("".join(lines))
+
+
+# Spawning note for run_command/run_pipeline: on Linux, CPython starts children
+# with vfork() instead of fork() (no page-table copy) as long as no preexec_fn,
+# user/group/extra_groups or umask is passed to Popen.  Keep it that way; use
+# `cwd=`/`env=` and fds created here (close-on-exec, dup2'd by Popen) instead.
 def run_command(
     cmd: list[str],
     check: bool = True,
     capture_output: bool = False,
     input: Optional[bytes] = None,
-    encoding: Optional[str] = "utf-8",
+    encoding: Optional[str] = None,
     suppress_stderr=False,
     cwd: Optional[Path] = None,
     env: Optional[dict] = None,
+    stdout: Optional[Union[int, TextIO, BinaryIO]] = None,
+    stderr: Optional[Union[int, TextIO, BinaryIO]] = None,
 ) -> subprocess.CompletedProcess:
     """
     Run a single command and handle its output.
@@ -140,22 +435,33 @@ def run_command(
         check: Whether to check the return code
         capture_output: Whether to capture the command output
         input: Optional bytes to pass as stdin
-        encoding: Text encoding to use, or None for binary mode
+        encoding: Text encoding to decode output with, or None (default) to keep it as bytes
         suppress_stderr: Whether to mute standard error output
         cwd: Working directory for the command
         env: Environment variables for the command (defaults to current process env)
+        stdout: Optional file object or file descriptor the command writes its output
+                to directly, without it passing through this process
+        stderr: Like `stdout`, for standard error (takes precedence over suppress_stderr)
 
     Returns:
         CompletedProcess instance
+
+    Raises:
+        ValueError: If `stdout` or `stderr` is combined with capture_output
     """
+    if capture_output:
+        if stdout is not None or stderr is not None:
+            raise ValueError("stdout/stderr may not be used with capture_output")
+        streams = {"capture_output": True}
+    else:
+        if stderr is None and suppress_stderr:
+            stderr = subprocess.DEVNULL
+        streams = {"stdout": stdout, "stderr": stderr}
     try:
         return subprocess.run(
             cmd,
             check=check,
-            capture_output=capture_output,
-            stderr=(
-                subprocess.DEVNULL if suppress_stderr and (not capture_output) else None
-            ),
+            **streams,
             input=input,
             text=encoding is not None,
             encoding=encoding,
@@ -163,20 +469,51 @@ def run_command(
             env=env,
         )
     except subprocess.CalledProcessError as e:
-        console.print(f"[red]Error running command:[/red] {' '.join(cmd)}")
-        if e.stdout:
-            console.print("[yellow]stdout:[/yellow]", e.stdout)
-        if e.stderr:
-            console.print("[red]stderr:[/red]", e.stderr)
+        _report_failure("Error running command", cmd, e.stdout, e.stderr)
         raise
 
 
+def _grow_pipe(fd: int) -> None:
+    """
+    Ask the kernel for a PIPE_SIZE buffer on either end of a pipe (Linux only).
+
+    Args:
+        fd: File descriptor of a pipe end
+    """
+    set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", None)
+    if set_pipe_size is not None:
+        try:
+            fcntl.fcntl(fd, set_pipe_size, PIPE_SIZE)
+        except OSError:
+            pass  # Above the unprivileged limit; keep the default size.
+
+
+def _make_pipe() -> Tuple[int, int]:
+    """
+    Create a close-on-exec pipe for connecting two pipeline stages.
+
+    On Linux the pipe is grown to 1 MiB (or `/proc/sys/fs/pipe-max-size`, if
+    that is lower) from the default 64 KiB, so a fast compressor and tar spend
+    less time blocked on a full or empty pipe.  Popen dup2()s the ends onto the
+    children's stdin/stdout, which clears close-on-exec for them only.
+
+    Returns:
+        Tuple[int, int]: (read_fd, write_fd)
+    """
+    if hasattr(os, "pipe2"):
+        read_fd, write_fd = os.pipe2(os.O_CLOEXEC)
+    else:
+        read_fd, write_fd = os.pipe()  # already non-inheritable (PEP 446)
+    _grow_pipe(write_fd)
+    return read_fd, write_fd
+
+
 def run_pipeline(
     cmds: list[list[str]],
     check: bool = True,
     stdin: Optional[Union[TextIO, BinaryIO]] = None,
-    stdout: Optional[Union[TextIO, BinaryIO]] = None,
-    encoding: Optional[str] = "utf-8",
+    stdout: Optional[Union[int, TextIO, BinaryIO]] = None,
+    encoding: Optional[str] = None,
     suppress_stderr: bool = False,
     cwd: Optional[Path] = None,
     env: Optional[dict] = None,
@@ -188,8 +525,8 @@ def run_pipeline(
         cmds: List of command lists, each in same format as run_command() cmd param
         check: Whether to check the return codes
         stdin: Optional file object to use as stdin for the first command
-        stdout: Optional file object to use as stdout for the last command
-        encoding: Text encoding to use, or None for binary mode
+        stdout: Optional file object or file descriptor to use as stdout for the last command
+        encoding: Text encoding to decode output with, or None (default) to keep it as bytes
         suppress_stderr: Whether to mute standard error output
         cwd: Working directory for all commands in the pipeline
         env: Environment variables for all commands (defaults to current process env)
@@ -205,64 +542,64 @@ def run_pipeline(
         raise ValueError("Pipeline requires at least one command")
 
     processes = []
-    stderr = subprocess.DEVNULL if suppress_stderr else subprocess.PIPE
-
-    # Start first process
-    first_proc = subprocess.Popen(
-        cmds[0],
-        stdin=stdin if stdin is not None else None,
-        stdout=subprocess.PIPE,
-        stderr=stderr,
-        text=encoding is not None,
-        encoding=encoding,
-        cwd=cwd,
-        env=env,
-    )
-    processes.append(first_proc)
-
-    # Create middle pipeline processes
-    for cmd in cmds[1:-1]:
-        proc = subprocess.Popen(
-            cmd,
-            stdin=processes[-1].stdout,
-            stdout=subprocess.PIPE,
-            stderr=stderr,
-            text=encoding is not None,
-            encoding=encoding,
-            cwd=cwd,
-            env=env,
-        )
+    # Only the last stage's stderr is captured: it is the only process that is
+    # communicate()d with, so a captured stderr on an earlier stage could fill
+    # up and stall the whole pipeline.  Earlier stages write to ours directly.
+    last_stderr = subprocess.DEVNULL if suppress_stderr else subprocess.PIPE
+    stage_stderr = subprocess.DEVNULL if suppress_stderr else None
+
+    # Each stage writes straight into a kernel pipe read by the next stage, so
+    # the data never passes through this process; `prev_stdin` is the read end
+    # the next stage gets.
+    prev_stdin = stdin
+    for i, cmd in enumerate(cmds):
+        is_last = i == len(cmds) - 1
+        read_fd, write_fd = (None, None) if is_last else _make_pipe()
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=prev_stdin,
+                stdout=stdout if is_last else write_fd,
+                stderr=last_stderr if is_last else stage_stderr,
+                text=encoding is not None,
+                encoding=encoding,
+                cwd=cwd,
+                env=env,
+            )
+        except BaseException:
+            if read_fd is not None:
+                os.close(read_fd)
+            for started in processes:
+                started.kill()
+                started.wait()
+            raise
+        finally:
+            # The children hold their own copies now; closing ours lets each
+            # stage see EOF (or SIGPIPE) when its neighbour exits.
+            if write_fd is not None:
+                os.close(write_fd)
+            if i > 0:
+                os.close(prev_stdin)
+        if proc.stderr is not None:
+            _grow_pipe(proc.stderr.fileno())
         processes.append(proc)
-        # Close previous process's stdout to avoid deadlocks
-        processes[-2].stdout.close()
-
-    # Start last process if there are multiple commands
-    if len(cmds) > 1:
-        last_proc = subprocess.Popen(
-            cmds[-1],
-            stdin=processes[-1].stdout,
-            stdout=stdout if stdout is not None else None,
-            stderr=stderr,
-            text=encoding is not None,
-            encoding=encoding,
-            cwd=cwd,
-            env=env,
-        )
-        processes.append(last_proc)
-        processes[-2].stdout.close()
-
-    # Collect output and wait for completion
-    stdout_out = stderr_output = None
-    return_codes = []
-
-    for proc in processes:
-        out, err = proc.communicate()
-        return_codes.append(proc.returncode)
-        if proc == processes[-1] and not stdout_out:
-            stdout_out = out
+        prev_stdin = read_fd
+
+    # Drain the last stage; once it has finished, every earlier stage has
+    # either finished too or will get SIGPIPE, so a plain wait() reaps them.
+    stdout_out, stderr_output = processes[-1].communicate()
+    if suppress_stderr:
         stderr_output = ""
-        if proc == processes[-1] and not suppress_stderr:
-            stderr_output = err
+    return_codes = [proc.wait() for proc in processes[:-1]]
+    return_codes.append(processes[-1].returncode)
+    # An earlier stage killed by SIGPIPE only means a later one stopped reading
+    # before it was done writing, e.g. tar exits at the end-of-archive marker
+    # without reading the record padding after it.  If the last stage
+    # succeeded, that was deliberate rather than a failure.
+    if return_codes[-1] == 0:
+        return_codes = [
+            0 if code == -signal.SIGPIPE else code for code in return_codes
+        ]
 
     # Check return codes if requested
     if check and any(code != 0 for code in return_codes):
@@ -272,11 +609,7 @@ def run_pipeline(
         error = subprocess.CalledProcessError(
             return_codes[failed_idx], failed_cmd, stdout_out, stderr_output
         )
-        console.print(f"[red]Error in pipeline command:[/red] {' '.join(failed_cmd)}")
-        if stdout_out:
-            console.print("[yellow]stdout:[/yellow]", stdout_out)
-        if stderr_output:
-            console.print("[red]stderr:[/red]", stderr_output)
+        _report_failure("Error in pipeline command", failed_cmd, stdout_out, stderr_output)
         raise error
 
     # Return CompletedProcess instance
@@ -285,6 +618,29 @@ def run_pipeline(
     )
 
 
+def remove_tree(path: Union[Path, str]) -> None:
+    """
+    Delete a directory tree, ignoring anything that is already gone.
+
+    An expanded borg repository can hold tens of thousands of segment files, so
+    the deletion is handed to `rm -rf`, which walks the tree in C; the Python
+    `shutil.rmtree` loop is only used where `rm` is missing or fails.
+
+    Args:
+        path: Directory to delete
+    """
+    if _which("rm"):
+        result = subprocess.run(
+            ["rm", "-rf", "--", str(path)],
+            check=False,
+            stdin=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if result.returncode == 0:
+            return
+    shutil.rmtree(path, ignore_errors=True)
+
+
 def ensure_dir(path: Path) -> None:
     """
     Ensure a directory exists, creating it if necessary.
@@ -295,23 +651,66 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def confirm_overwrite(path: Path) -> bool:
+def confirm_overwrite_many(paths: Iterable[Path]) -> bool:
     """
-    Ask for confirmation before overwriting a path.
+    Ask once for confirmation before overwriting any of several paths.
+
+    Existence is checked with one `os.scandir` per parent directory rather than
+    a stat per path, and all the conflicts are listed in a single prompt.  When
+    stdin is not a terminal (cron, CI, a pipe) there is nobody to ask, so the
+    overwrite is allowed without reading from stdin.
 
     Args:
-        path: Path to check
+        paths: Paths that are about to be written
 
     Returns:
-        True if user confirms, False otherwise
+        True if none of the paths exist, the user confirms, or stdin is not
+        interactive; False otherwise
     """
-    if not path.exists():
+    by_parent: dict[Path, list[Path]] = {}
+    for path in paths:
+        path = Path(path)
+        by_parent.setdefault(path.parent, []).append(path)
+
+    conflicts = []
+    for parent, children in by_parent.items():
+        try:
+            with os.scandir(parent) as entries:
+                names = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except OSError:
+            # The parent exists but cannot be listed: check each path instead.
+            conflicts.extend(child for child in children if os.path.lexists(child))
+            continue
+        conflicts.extend(child for child in children if child.name in names)
+
+    if not conflicts or not sys.stdin.isatty():
         return True
 
-    response = Confirm.ask(
-        f"[yellow]{path}[/yellow] already exists. Contents will be overwritten if you continue.\n"
+    if len(conflicts) == 1:
+        subject = f"[yellow]{conflicts[0]}[/yellow] already exists. "
+    else:
+        listing = "\n".join(f"  [yellow]{path}[/yellow]" for path in conflicts)
+        subject = f"These paths already exist:\n{listing}\n"
+    return Confirm.ask(
+        f"{subject}Contents will be overwritten if you continue.\n"
         "Are you sure?",
         default=False,
     )
 
-    return response
+
+def confirm_overwrite(path: Path) -> bool:
+    """
+    Ask for confirmation before overwriting a path.
+
+    When stdin is not a terminal (cron, CI, a pipe) there is nobody to ask, so
+    the overwrite is allowed without reading from stdin.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        True if user confirms (or stdin is not interactive), False otherwise
+    """
+    return confirm_overwrite_many([path])
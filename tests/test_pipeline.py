@@ -0,0 +1,93 @@
+"""
+Regression checks for the subprocess pipelines borg-archive builds.
+
+ Run with `python -m unittest discover tests`.  Checks that need tools which
+ are not installed (tar, a compressor) are skipped; borg itself is not needed.
+
+ MIT License
+
+ Copyright 2025 Jason L. Causey
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy of
+ this software and associated documentation files (the "Software"), to deal in
+ the Software without restriction, including without limitation the rights to
+ use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+ of the Software, and to permit persons to whom the Software is furnished to do
+ so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in all
+ copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from borg_archive.core import BorgArchive
+from borg_archive.exceptions import CommandNotFoundError
+from borg_archive.utils import get_best_compressor, run_pipeline
+
+# Round trips per run.  The failure this guards against was intermittent
+# (a few percent of runs), so a single round trip would rarely catch it.
+ROUND_TRIPS = 50
+
+
+class RunPipelineTest(unittest.TestCase):
+    def test_upstream_sigpipe_is_not_a_failure(self):
+        # `head` stops reading early and exits 0; `yes` then dies of SIGPIPE.
+        result = run_pipeline([["yes"], ["head", "-n", "1"]], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, b"y\n")
+
+    def test_failing_stage_still_raises(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            run_pipeline([["false"], ["cat"]], suppress_stderr=True)
+
+
+class TarRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        if shutil.which("tar") is None:
+            self.skipTest("tar is not installed")
+        try:
+            get_best_compressor("tar")
+        except CommandNotFoundError:
+            self.skipTest("no tar compressor is installed")
+        self.work_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.work_dir, ignore_errors=True)
+        # Stands in for a borg repository: a few files, one larger than a
+        # 256 KiB tar record, so the archive ends in a partly padded record.
+        self.repo_dir = self.work_dir / "borg-repo"
+        (self.repo_dir / "data").mkdir(parents=True)
+        (self.repo_dir / "config").write_text("[repository]\n")
+        (self.repo_dir / "data" / "0").write_bytes(os.urandom(300 * 1024))
+        (self.repo_dir / "data" / "1").write_bytes(os.urandom(1000))
+
+    @mock.patch("borg_archive.core.check_required_commands")
+    def test_create_then_expand_repeatedly(self, _check):
+        archive_path = self.work_dir / "archive.tar"
+        with BorgArchive(archive_path) as archive:
+            archive._BorgArchive__create_compressed_archive(repo_dir=self.repo_dir)
+            for i in range(ROUND_TRIPS):
+                expanded = self.work_dir / f"expanded-{i}"
+                expanded.mkdir()
+                archive._BorgArchive__extract_compressed_archive(repo_dir=expanded)
+                self.assertEqual(
+                    (expanded / "data" / "0").read_bytes(),
+                    (self.repo_dir / "data" / "0").read_bytes(),
+                )
+                shutil.rmtree(expanded)
+
+
+if __name__ == "__main__":
+    unittest.main()